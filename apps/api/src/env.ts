@@ -88,6 +88,11 @@ export const env = {
 		"OPENROUTER_EMBEDDING_MODEL",
 		"openai/text-embedding-3-small"
 	),
+	// Max concurrent OpenRouter embedding requests per process (size to your rate limits)
+	OPENROUTER_EMBEDDING_MAX_CONCURRENCY: +getEnvVariable(
+		"OPENROUTER_EMBEDDING_MAX_CONCURRENCY",
+		"10"
+	),
 	// RAG service URL for chunking
 	RAG_SERVICE_URL: getEnvVariable("RAG_SERVICE_URL", "http://localhost:8082"),
 	// Firecrawl API key for web scraping
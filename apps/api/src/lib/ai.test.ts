@@ -0,0 +1,176 @@
+import { afterAll, beforeEach, describe, expect, it, mock } from "bun:test";
+
+type EmbedManyArgs = { values: string[] };
+
+// Each text "tN" embeds to [N + 0.1] so results can be matched to inputs
+const embedText = (text: string) => [Number(text.slice(1)) + 0.1];
+
+const embedManyMock = mock((async ({ values }: EmbedManyArgs) => ({
+	embeddings: values.map(embedText),
+})) as (args: EmbedManyArgs) => Promise<{ embeddings: number[][] }>);
+
+class MockAPICallError extends Error {
+	readonly isRetryable: boolean;
+
+	constructor(isRetryable: boolean) {
+		super(isRetryable ? "rate limited" : "input too long");
+		this.isRetryable = isRetryable;
+	}
+
+	static isInstance(error: unknown): error is MockAPICallError {
+		return error instanceof MockAPICallError;
+	}
+}
+
+class MockRetryError extends Error {
+	readonly lastError: unknown;
+
+	constructor(lastError: unknown) {
+		super("retries exhausted");
+		this.lastError = lastError;
+	}
+
+	static isInstance(error: unknown): error is MockRetryError {
+		return error instanceof MockRetryError;
+	}
+}
+
+mock.module("@api/env", () => ({
+	env: {
+		NODE_ENV: "test",
+		OPENROUTER_API_KEY: "test-key",
+		OPENROUTER_EMBEDDING_MODEL: "openai/text-embedding-3-small",
+		OPENROUTER_EMBEDDING_MAX_CONCURRENCY: 10,
+	},
+}));
+
+mock.module("@openrouter/ai-sdk-provider", () => ({
+	createOpenRouter: () => ({
+		chat: (modelId: string) => ({ modelId }),
+		textEmbeddingModel: (modelId: string) => ({ modelId }),
+	}),
+}));
+
+mock.module("@ai-sdk/devtools", () => ({
+	devToolsMiddleware: () => ({}),
+}));
+
+mock.module("ai", () => ({
+	APICallError: MockAPICallError,
+	RetryError: MockRetryError,
+	embedMany: embedManyMock,
+	wrapLanguageModel: ({ model }: { model: unknown }) => model,
+	generateObject: mock(),
+	generateText: mock(),
+	hasToolCall: mock(),
+	Output: {},
+	stepCountIs: mock(),
+	streamObject: mock(),
+	streamText: mock(),
+	ToolLoopAgent: class {},
+}));
+
+const modulePromise = import("./ai");
+
+afterAll(() => {
+	mock.restore();
+});
+
+beforeEach(() => {
+	embedManyMock.mockClear();
+	embedManyMock.mockImplementation(async ({ values }) => ({
+		embeddings: values.map(embedText),
+	}));
+});
+
+describe("generateEmbeddings", () => {
+	it("embeds each distinct text once and returns vectors in input order", async () => {
+		const { generateEmbeddings } = await modulePromise;
+
+		// 274 texts but only 150 distinct ones (t0-t119 appear twice, plus two
+		// more repeats), so the unique set spans two upstream sub-batches
+		const distinct = Array.from({ length: 150 }, (_, i) => `t${i}`);
+		const texts = [...distinct.slice(0, 120), ...distinct, "t3", "t149"];
+
+		const embeddings = await generateEmbeddings(texts);
+
+		const upstreamValues = embedManyMock.mock.calls.map(
+			([args]) => args.values
+		);
+		expect(upstreamValues.map((values) => values.length)).toEqual([96, 54]);
+		expect(upstreamValues.flat()).toEqual(distinct);
+		expect(embeddings).toEqual(texts.map(embedText));
+	});
+
+	it("stops dispatching sub-batches after one fails", async () => {
+		const { generateEmbeddings } = await modulePromise;
+		embedManyMock.mockImplementation(async ({ values }) => {
+			if (values[0] === "t0") {
+				throw new Error("upstream failed");
+			}
+			await new Promise((resolve) => setTimeout(resolve, 10));
+			return { embeddings: values.map(embedText) };
+		});
+
+		// 10 sub-batches; only the first 5 should ever be requested
+		const texts = Array.from({ length: 960 }, (_, i) => `t${i}`);
+
+		await expect(generateEmbeddings(texts)).rejects.toThrow("upstream failed");
+		await new Promise((resolve) => setTimeout(resolve, 50));
+
+		expect(embedManyMock).toHaveBeenCalledTimes(5);
+	});
+});
+
+describe("generateEmbedding", () => {
+	it("serves repeated queries from the cache at the same precision", async () => {
+		const { generateEmbedding } = await modulePromise;
+
+		const first = await generateEmbedding("t7001");
+		const second = await generateEmbedding("t7001");
+
+		expect(embedManyMock).toHaveBeenCalledTimes(1);
+		expect(first).toEqual(Array.from(Float32Array.from([7001.1])));
+		expect(second).toEqual(first);
+	});
+
+	it("rejects coalesced queries together on a retryable failure", async () => {
+		const { generateEmbedding } = await modulePromise;
+		embedManyMock.mockImplementation(async () => {
+			throw new MockRetryError(new MockAPICallError(true));
+		});
+
+		const results = await Promise.allSettled([
+			generateEmbedding("t8001"),
+			generateEmbedding("t8002"),
+		]);
+
+		expect(results.map((result) => result.status)).toEqual([
+			"rejected",
+			"rejected",
+		]);
+		// No per-text retries on top of embedMany's own retries
+		expect(embedManyMock).toHaveBeenCalledTimes(1);
+	});
+
+	it("only fails the query whose input the upstream rejects", async () => {
+		const { generateEmbedding } = await modulePromise;
+		embedManyMock.mockImplementation(async ({ values }) => {
+			if (values.includes("t8004")) {
+				throw new MockAPICallError(false);
+			}
+			return { embeddings: values.map(embedText) };
+		});
+
+		const results = await Promise.allSettled([
+			generateEmbedding("t8003"),
+			generateEmbedding("t8004"),
+		]);
+
+		expect(results.map((result) => result.status)).toEqual([
+			"fulfilled",
+			"rejected",
+		]);
+		expect(embedManyMock).toHaveBeenCalledTimes(3);
+	});
+});
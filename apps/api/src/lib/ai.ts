@@ -18,8 +18,20 @@
 
 import { devToolsMiddleware } from "@ai-sdk/devtools";
 import { env } from "@api/env";
+import { createConcurrencyLimiter } from "@api/lib/concurrency-limiter";
+import {
+	createEmbeddingBatcher,
+	type EmbeddingBatcher,
+} from "@api/lib/embedding-batcher";
+import { createEmbeddingCache } from "@api/lib/embedding-cache";
 import { createOpenRouter } from "@openrouter/ai-sdk-provider";
-import { embed, embedMany, type LanguageModel, wrapLanguageModel } from "ai";
+import {
+	APICallError,
+	embedMany,
+	type LanguageModel,
+	RetryError,
+	wrapLanguageModel,
+} from "ai";
 
 // Re-export commonly used AI SDK functions for convenience
 export {
@@ -125,18 +137,46 @@ export function createModelRaw(modelId: string): LanguageModel {
 	return openrouter.chat(modelId);
 }
 
+type EmbeddingModel = ReturnType<
+	ReturnType<typeof createOpenRouter>["textEmbeddingModel"]
+>;
+
 /**
- * Create an embedding model using the OpenRouter provider.
+ * Embedding model instances keyed by model ID, reused across calls
  */
-function createEmbeddingModel(modelId?: string) {
-	const openrouter = getOpenRouter();
-	return openrouter.textEmbeddingModel(
+const embeddingModels = new Map<string, EmbeddingModel>();
+
+/**
+ * Resolve the embedding model ID, falling back to the configured default.
+ */
+function resolveEmbeddingModelId(modelId?: string): string {
+	return (
 		modelId ?? env.OPENROUTER_EMBEDDING_MODEL ?? "openai/text-embedding-3-small"
 	);
 }
 
+/**
+ * Get or create an embedding model using the OpenRouter provider.
+ */
+function createEmbeddingModel(modelId: string): EmbeddingModel {
+	let model = embeddingModels.get(modelId);
+	if (!model) {
+		model = getOpenRouter().textEmbeddingModel(modelId);
+		embeddingModels.set(modelId, model);
+	}
+
+	return model;
+}
+
+/**
+ * Process-wide cache of query embeddings keyed by model and text content
+ */
+const embeddingCache = createEmbeddingCache();
+
 /**
  * Generate an embedding for a single text using AI SDK with OpenRouter.
+ * Cached texts resolve immediately; otherwise calls made within a few
+ * milliseconds of each other are coalesced into one batched upstream request.
  *
  * @param text - The text to embed
  * @param model - Optional model override (defaults to OPENROUTER_EMBEDDING_MODEL env var)
@@ -146,16 +186,100 @@ export async function generateEmbedding(
 	text: string,
 	model?: string
 ): Promise<number[]> {
-	const { embedding } = await embed({
-		model: createEmbeddingModel(model),
-		value: text,
-	});
-	return embedding;
+	const modelId = resolveEmbeddingModelId(model);
+	const cached = embeddingCache.get(modelId, text);
+	if (cached) {
+		return cached;
+	}
+
+	const embedding = await getEmbeddingBatcher(model).submit(text);
+	// Return what the cache stores so hits and misses share float32 precision
+	return embeddingCache.set(modelId, text, embedding);
+}
+
+/**
+ * Whether an embedding call failed with a non-retryable API error (e.g. a
+ * 400 for an over-long input), as opposed to a rate limit or outage that
+ * embedMany has already retried.
+ */
+function isNonRetryableEmbeddingError(error: unknown): boolean {
+	const cause = RetryError.isInstance(error) ? error.lastError : error;
+	return APICallError.isInstance(cause) && !cause.isRetryable;
+}
+
+/**
+ * Embedding batchers keyed by model override, so concurrent single-text
+ * requests for the same model are coalesced into one upstream call
+ */
+const embeddingBatchers = new Map<string | undefined, EmbeddingBatcher>();
+
+function getEmbeddingBatcher(model?: string): EmbeddingBatcher {
+	let batcher = embeddingBatchers.get(model);
+	if (!batcher) {
+		batcher = createEmbeddingBatcher({
+			embed: (texts) => generateEmbeddings(texts, model),
+			isInputError: isNonRetryableEmbeddingError,
+		});
+		embeddingBatchers.set(model, batcher);
+	}
+
+	return batcher;
+}
+
+/**
+ * Maximum number of texts sent to OpenRouter in a single embedding request
+ */
+const EMBEDDING_MAX_BATCH_SIZE = 96;
+
+/**
+ * Maximum number of embedding sub-batch requests in flight per call
+ */
+const EMBEDDING_MAX_PARALLEL_CALLS = 5;
+
+/**
+ * Retries per embedding sub-batch on 429/5xx. The AI SDK backs off
+ * exponentially and honors Retry-After headers between attempts.
+ */
+const EMBEDDING_MAX_RETRIES = 4;
+
+const DEFAULT_EMBEDDING_MAX_CONCURRENT_REQUESTS = 10;
+
+/**
+ * Resolve the process-wide embedding request cap from
+ * OPENROUTER_EMBEDDING_MAX_CONCURRENCY, falling back to the default when the
+ * configured value is not a positive integer.
+ */
+function resolveEmbeddingMaxConcurrentRequests(): number {
+	const configured = env.OPENROUTER_EMBEDDING_MAX_CONCURRENCY;
+
+	if (Number.isInteger(configured) && configured > 0) {
+		return configured;
+	}
+
+	console.warn(
+		`[ai] Ignoring invalid OPENROUTER_EMBEDDING_MAX_CONCURRENCY (${configured}), using ${DEFAULT_EMBEDDING_MAX_CONCURRENT_REQUESTS}`
+	);
+
+	return DEFAULT_EMBEDDING_MAX_CONCURRENT_REQUESTS;
 }
 
+/**
+ * Maximum number of embedding requests in flight across the whole process.
+ * Keeps concurrent callers under OpenRouter rate limits instead of
+ * triggering 429s.
+ */
+const embeddingRequestLimiter = createConcurrencyLimiter({
+	maxConcurrent: resolveEmbeddingMaxConcurrentRequests(),
+});
+
 /**
  * Generate embeddings for multiple texts using AI SDK with OpenRouter.
- * The AI SDK automatically handles chunking for large requests.
+ * Duplicate texts are only embedded once. Distinct texts are split into
+ * sub-batches that are sent concurrently (bounded by
+ * EMBEDDING_MAX_PARALLEL_CALLS) and reassembled in input order.
+ *
+ * Bypasses the embedding cache: bulk callers such as AI training only embed
+ * changed content, so hashing and caching every chunk would not pay off.
  *
  * @param texts - Array of texts to embed
  * @param model - Optional model override (defaults to OPENROUTER_EMBEDDING_MODEL env var)
@@ -169,11 +293,75 @@ export async function generateEmbeddings(
 		return [];
 	}
 
-	const { embeddings } = await embedMany({
-		model: createEmbeddingModel(model),
-		values: texts,
-	});
-	return embeddings;
+	// De-duplicate texts so each distinct one is embedded once
+	const uniqueTexts: string[] = [];
+	const uniqueIndexByText = new Map<string, number>();
+	const uniqueIndexByPosition: number[] = new Array(texts.length);
+
+	for (const [position, text] of texts.entries()) {
+		let uniqueIndex = uniqueIndexByText.get(text);
+		if (uniqueIndex === undefined) {
+			uniqueIndex = uniqueTexts.length;
+			uniqueTexts.push(text);
+			uniqueIndexByText.set(text, uniqueIndex);
+		}
+		uniqueIndexByPosition[position] = uniqueIndex;
+	}
+
+	const embeddings = await embedInBatches(
+		createEmbeddingModel(resolveEmbeddingModelId(model)),
+		uniqueTexts
+	);
+
+	return uniqueIndexByPosition.map((uniqueIndex) => embeddings[uniqueIndex]);
+}
+
+/**
+ * Embed texts in sub-batches of EMBEDDING_MAX_BATCH_SIZE with at most
+ * EMBEDDING_MAX_PARALLEL_CALLS requests in flight.
+ */
+async function embedInBatches(
+	embeddingModel: EmbeddingModel,
+	texts: string[]
+): Promise<number[][]> {
+	const batches: string[][] = [];
+	for (let i = 0; i < texts.length; i += EMBEDDING_MAX_BATCH_SIZE) {
+		batches.push(texts.slice(i, i + EMBEDDING_MAX_BATCH_SIZE));
+	}
+
+	const batchResults: number[][][] = new Array(batches.length);
+	let nextBatchIndex = 0;
+	let failed = false;
+
+	// Each runner pulls the next pending batch until none are left, and stops
+	// taking new batches once any batch has failed
+	const runBatches = async () => {
+		while (!failed && nextBatchIndex < batches.length) {
+			const batchIndex = nextBatchIndex++;
+			try {
+				const { embeddings } = await embeddingRequestLimiter.run(() =>
+					embedMany({
+						model: embeddingModel,
+						values: batches[batchIndex],
+						maxRetries: EMBEDDING_MAX_RETRIES,
+					})
+				);
+				batchResults[batchIndex] = embeddings;
+			} catch (error) {
+				failed = true;
+				throw error;
+			}
+		}
+	};
+
+	await Promise.all(
+		Array.from(
+			{ length: Math.min(EMBEDDING_MAX_PARALLEL_CALLS, batches.length) },
+			runBatches
+		)
+	);
+
+	return batchResults.flat();
 }
 
 /**
@@ -0,0 +1,62 @@
+import { describe, expect, it } from "bun:test";
+import { createConcurrencyLimiter } from "./concurrency-limiter";
+
+function createTracker() {
+	let active = 0;
+	let maxActive = 0;
+	const started: string[] = [];
+
+	const task = (name: string) => async () => {
+		started.push(name);
+		active++;
+		maxActive = Math.max(maxActive, active);
+		await new Promise((resolve) => setTimeout(resolve, 5));
+		active--;
+		return name;
+	};
+
+	return { task, started, getMaxActive: () => maxActive };
+}
+
+describe("createConcurrencyLimiter", () => {
+	it("never runs more tasks than the cap", async () => {
+		const limiter = createConcurrencyLimiter({ maxConcurrent: 2 });
+		const tracker = createTracker();
+
+		const results = await Promise.all(
+			["a", "b", "c", "d", "e"].map((name) => limiter.run(tracker.task(name)))
+		);
+
+		expect(results).toEqual(["a", "b", "c", "d", "e"]);
+		expect(tracker.getMaxActive()).toBe(2);
+	});
+
+	it("hands a freed slot to the next queued task before new arrivals", async () => {
+		const limiter = createConcurrencyLimiter({ maxConcurrent: 1 });
+		const tracker = createTracker();
+
+		const first = limiter.run(tracker.task("first"));
+		const queued = limiter.run(tracker.task("queued"));
+
+		await first;
+		// Arrives after the slot was freed but while "queued" holds it
+		const late = limiter.run(tracker.task("late"));
+
+		await Promise.all([queued, late]);
+
+		expect(tracker.started).toEqual(["first", "queued", "late"]);
+		expect(tracker.getMaxActive()).toBe(1);
+	});
+
+	it("releases the slot when a task rejects", async () => {
+		const limiter = createConcurrencyLimiter({ maxConcurrent: 1 });
+
+		await expect(
+			limiter.run(async () => {
+				throw new Error("failed");
+			})
+		).rejects.toThrow("failed");
+
+		expect(await limiter.run(async () => "next")).toBe("next");
+	});
+});
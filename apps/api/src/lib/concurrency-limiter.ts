@@ -0,0 +1,47 @@
+/**
+ * Concurrency Limiter
+ *
+ * Caps how many async tasks run at once. Tasks over the cap wait in FIFO
+ * order, and a finishing task hands its slot directly to the next queued
+ * one, so a task started later cannot jump the queue.
+ */
+
+export type ConcurrencyLimiterOptions = {
+	/** Maximum number of tasks running at the same time */
+	maxConcurrent: number;
+};
+
+export type ConcurrencyLimiter = {
+	run: <T>(task: () => Promise<T>) => Promise<T>;
+};
+
+export function createConcurrencyLimiter({
+	maxConcurrent,
+}: ConcurrencyLimiterOptions): ConcurrencyLimiter {
+	let activeCount = 0;
+	const queued: (() => void)[] = [];
+
+	return {
+		run: async <T>(task: () => Promise<T>): Promise<T> => {
+			if (activeCount < maxConcurrent) {
+				activeCount++;
+			} else {
+				// The releasing task keeps activeCount unchanged and hands us its slot
+				await new Promise<void>((resolve) => {
+					queued.push(resolve);
+				});
+			}
+
+			try {
+				return await task();
+			} finally {
+				const next = queued.shift();
+				if (next) {
+					next();
+				} else {
+					activeCount--;
+				}
+			}
+		},
+	};
+}
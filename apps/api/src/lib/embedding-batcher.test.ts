@@ -0,0 +1,116 @@
+import { describe, expect, it, mock } from "bun:test";
+import { createEmbeddingBatcher } from "./embedding-batcher";
+
+describe("createEmbeddingBatcher", () => {
+	it("coalesces concurrent submissions into one embed call", async () => {
+		const embed = mock(async (texts: string[]) =>
+			texts.map((text) => [text.length])
+		);
+		const batcher = createEmbeddingBatcher({ embed, maxWaitMs: 5 });
+
+		const results = await Promise.all([
+			batcher.submit("a"),
+			batcher.submit("bb"),
+			batcher.submit("ccc"),
+		]);
+
+		expect(embed).toHaveBeenCalledTimes(1);
+		expect(embed.mock.calls[0]?.[0]).toEqual(["a", "bb", "ccc"]);
+		expect(results).toEqual([[1], [2], [3]]);
+	});
+
+	it("flushes early once the batch size is reached", async () => {
+		const embed = mock(async (texts: string[]) => texts.map(() => [0]));
+		const batcher = createEmbeddingBatcher({
+			embed,
+			maxWaitMs: 1000,
+			maxBatchSize: 2,
+		});
+
+		// Resolves well before maxWaitMs only if the second submit flushed
+		await Promise.race([
+			Promise.all([batcher.submit("a"), batcher.submit("b")]),
+			new Promise((_, reject) =>
+				setTimeout(() => reject(new Error("batch was not flushed early")), 100)
+			),
+		]);
+
+		expect(embed).toHaveBeenCalledTimes(1);
+	});
+
+	it("only fails the caller whose text the upstream rejects", async () => {
+		const embed = mock(async (texts: string[]) => {
+			if (texts.includes("bad")) {
+				throw new Error("input too long");
+			}
+			return texts.map((text) => [text.length]);
+		});
+		const batcher = createEmbeddingBatcher({
+			embed,
+			maxWaitMs: 5,
+			isInputError: () => true,
+		});
+
+		const results = await Promise.allSettled([
+			batcher.submit("good"),
+			batcher.submit("bad"),
+		]);
+
+		expect(results[0]).toEqual({ status: "fulfilled", value: [4] });
+		expect(results[1]?.status).toBe("rejected");
+		// One coalesced call, then one retry per text
+		expect(embed).toHaveBeenCalledTimes(3);
+	});
+
+	it("does not retry texts individually after a transient failure", async () => {
+		const embed = mock(async () => {
+			throw new Error("rate limited");
+		});
+		const batcher = createEmbeddingBatcher({
+			embed,
+			maxWaitMs: 5,
+			isInputError: () => false,
+		});
+
+		const results = await Promise.allSettled([
+			batcher.submit("a"),
+			batcher.submit("b"),
+		]);
+
+		expect(results.map((result) => result.status)).toEqual([
+			"rejected",
+			"rejected",
+		]);
+		expect(embed).toHaveBeenCalledTimes(1);
+	});
+
+	it("rejects instead of hanging when embed throws synchronously", async () => {
+		const batcher = createEmbeddingBatcher({
+			embed: () => {
+				throw new Error("sync failure");
+			},
+			maxWaitMs: 5,
+		});
+
+		await expect(batcher.submit("a")).rejects.toThrow("sync failure");
+	});
+
+	it("rejects every pending submission when the batch fails", async () => {
+		const batcher = createEmbeddingBatcher({
+			embed: async () => {
+				throw new Error("upstream failed");
+			},
+			maxWaitMs: 5,
+		});
+
+		const results = await Promise.allSettled([
+			batcher.submit("a"),
+			batcher.submit("b"),
+		]);
+
+		expect(results.map((result) => result.status)).toEqual([
+			"rejected",
+			"rejected",
+		]);
+	});
+});
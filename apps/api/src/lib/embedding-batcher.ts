@@ -0,0 +1,114 @@
+/**
+ * Embedding Batcher
+ *
+ * Coalesces single-text embedding requests that arrive within a short
+ * window into one upstream call, then resolves each caller with its own
+ * vector. Concurrent vector searches share a request instead of each
+ * paying for a round-trip to OpenRouter. If a coalesced call fails because
+ * of one of its inputs, each text is retried on its own so one bad input
+ * only fails its own caller. Any other failure rejects the whole batch, so
+ * rate limits and outages are not multiplied into per-text retries.
+ */
+
+const DEFAULT_MAX_WAIT_MS = 15;
+const DEFAULT_MAX_BATCH_SIZE = 128;
+
+type PendingEmbedding = {
+	text: string;
+	resolve: (embedding: number[]) => void;
+	reject: (error: unknown) => void;
+};
+
+export type EmbeddingBatcherOptions = {
+	/** Embeds a batch of texts, returning vectors in input order */
+	embed: (texts: string[]) => Promise<number[][]>;
+	/** How long to wait for more texts before flushing (default: 15ms) */
+	maxWaitMs?: number;
+	/** Flush immediately once this many texts are queued (default: 128) */
+	maxBatchSize?: number;
+	/**
+	 * Whether a batch error was caused by a specific input, in which case each
+	 * text is retried on its own (default: never)
+	 */
+	isInputError?: (error: unknown) => boolean;
+};
+
+export type EmbeddingBatcher = {
+	submit: (text: string) => Promise<number[]>;
+};
+
+export function createEmbeddingBatcher({
+	embed,
+	maxWaitMs = DEFAULT_MAX_WAIT_MS,
+	maxBatchSize = DEFAULT_MAX_BATCH_SIZE,
+	isInputError = () => false,
+}: EmbeddingBatcherOptions): EmbeddingBatcher {
+	let pending: PendingEmbedding[] = [];
+	let flushTimer: ReturnType<typeof setTimeout> | null = null;
+
+	// Defer the call so a synchronous throw from embed becomes a rejection
+	const embedBatch = (batch: PendingEmbedding[]) =>
+		Promise.resolve().then(() => embed(batch.map((item) => item.text)));
+
+	const settleBatch = (batch: PendingEmbedding[], embeddings: number[][]) => {
+		for (const [index, item] of batch.entries()) {
+			const embedding = embeddings[index];
+			if (embedding) {
+				item.resolve(embedding);
+			} else {
+				item.reject(
+					new Error(
+						`[embedding-batcher] Missing embedding for batch item ${index}`
+					)
+				);
+			}
+		}
+	};
+
+	const flush = () => {
+		if (flushTimer) {
+			clearTimeout(flushTimer);
+			flushTimer = null;
+		}
+
+		const batch = pending;
+		pending = [];
+
+		if (batch.length === 0) {
+			return;
+		}
+
+		embedBatch(batch).then(
+			(embeddings) => settleBatch(batch, embeddings),
+			(error) => {
+				if (batch.length === 1 || !isInputError(error)) {
+					for (const item of batch) {
+						item.reject(error);
+					}
+					return;
+				}
+
+				// Retry each text on its own so a bad text only fails its own caller
+				for (const item of batch) {
+					embedBatch([item]).then(
+						(embeddings) => settleBatch([item], embeddings),
+						(itemError) => item.reject(itemError)
+					);
+				}
+			}
+		);
+	};
+
+	return {
+		submit: (text) =>
+			new Promise<number[]>((resolve, reject) => {
+				pending.push({ text, resolve, reject });
+
+				if (pending.length >= maxBatchSize) {
+					flush();
+				} else if (!flushTimer) {
+					flushTimer = setTimeout(flush, maxWaitMs);
+				}
+			}),
+	};
+}
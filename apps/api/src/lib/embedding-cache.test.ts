@@ -0,0 +1,35 @@
+import { describe, expect, it } from "bun:test";
+import { createEmbeddingCache } from "./embedding-cache";
+
+describe("createEmbeddingCache", () => {
+	it("returns cached embeddings per model and text", () => {
+		const cache = createEmbeddingCache();
+		cache.set("model-a", "hello", [0.5, -0.25]);
+
+		expect(cache.get("model-a", "hello")).toEqual([0.5, -0.25]);
+		expect(cache.get("model-b", "hello")).toBeUndefined();
+		expect(cache.get("model-a", "hello!")).toBeUndefined();
+	});
+
+	it("returns the same float32-rounded vector from set and get", () => {
+		const cache = createEmbeddingCache();
+		const stored = cache.set("model", "text", [0.1, 0.2]);
+
+		expect(stored).toEqual(Array.from(Float32Array.from([0.1, 0.2])));
+		expect(cache.get("model", "text")).toEqual(stored);
+	});
+
+	it("evicts the least recently used entry when full", () => {
+		const cache = createEmbeddingCache({ maxEntries: 2 });
+		cache.set("model", "a", [1]);
+		cache.set("model", "b", [2]);
+
+		// Touch "a" so "b" becomes the least recently used entry
+		cache.get("model", "a");
+		cache.set("model", "c", [3]);
+
+		expect(cache.get("model", "a")).toEqual([1]);
+		expect(cache.get("model", "b")).toBeUndefined();
+		expect(cache.get("model", "c")).toEqual([3]);
+	});
+});
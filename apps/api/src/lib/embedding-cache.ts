@@ -0,0 +1,72 @@
+/**
+ * Embedding Cache
+ *
+ * In-memory LRU cache of embeddings keyed by a hash of the model ID and
+ * text. Repeated visitor queries often embed identical text, and a cache
+ * hit skips the OpenRouter call entirely.
+ *
+ * Vectors are stored as Float32Array to halve memory per entry. pgvector
+ * stores embeddings as float4, so no precision that matters is lost.
+ * Callers should use the vector returned by `set` so a miss and a later
+ * hit for the same text return identical values.
+ */
+
+import { createHash } from "node:crypto";
+
+const DEFAULT_MAX_ENTRIES = 5000;
+
+export type EmbeddingCacheOptions = {
+	/** Maximum number of embeddings kept before evicting the oldest (default: 5000) */
+	maxEntries?: number;
+};
+
+export type EmbeddingCache = {
+	get: (modelId: string, text: string) => number[] | undefined;
+	/** Stores the embedding and returns it at the cached float32 precision */
+	set: (modelId: string, text: string, embedding: number[]) => number[];
+};
+
+function getCacheKey(modelId: string, text: string): string {
+	return createHash("sha256")
+		.update(modelId)
+		.update("\0")
+		.update(text)
+		.digest("base64");
+}
+
+export function createEmbeddingCache({
+	maxEntries = DEFAULT_MAX_ENTRIES,
+}: EmbeddingCacheOptions = {}): EmbeddingCache {
+	// Map iteration order is insertion order, so the first key is the least
+	// recently used one
+	const entries = new Map<string, Float32Array>();
+
+	return {
+		get: (modelId, text) => {
+			const key = getCacheKey(modelId, text);
+			const embedding = entries.get(key);
+			if (!embedding) {
+				return;
+			}
+
+			entries.delete(key);
+			entries.set(key, embedding);
+			return Array.from(embedding);
+		},
+		set: (modelId, text, embedding) => {
+			const key = getCacheKey(modelId, text);
+			const stored = Float32Array.from(embedding);
+			entries.delete(key);
+			entries.set(key, stored);
+
+			if (entries.size > maxEntries) {
+				const oldestKey = entries.keys().next().value;
+				if (oldestKey !== undefined) {
+					entries.delete(oldestKey);
+				}
+			}
+
+			return Array.from(stored);
+		},
+	};
+}
@@ -0,0 +1,45 @@
+import { describe, expect, it } from "bun:test";
+import { chunkText } from "./text-chunker";
+
+describe("chunkText", () => {
+	it("returns no chunks for blank text", () => {
+		expect(chunkText("   \n\n ")).toEqual([]);
+	});
+
+	it("keeps short text in a single chunk", () => {
+		const chunks = chunkText("First paragraph.\n\nSecond paragraph.");
+
+		expect(chunks).toEqual([
+			{
+				content: "First paragraph.\n\nSecond paragraph.",
+				index: 0,
+				startOffset: 0,
+				endOffset: 35,
+			},
+		]);
+	});
+
+	it("splits on paragraph boundaries and respects the chunk size", () => {
+		const paragraph = "word ".repeat(30).trim();
+		const text = [paragraph, paragraph, paragraph].join("\n\n");
+
+		const chunks = chunkText(text, { chunkSize: 200, chunkOverlap: 0 });
+
+		expect(chunks.length).toBeGreaterThan(1);
+		for (const [index, chunk] of chunks.entries()) {
+			expect(chunk.index).toBe(index);
+			expect(chunk.content.length).toBeLessThanOrEqual(200);
+		}
+	});
+
+	it("falls back to character splits for unbroken text", () => {
+		const chunks = chunkText("a".repeat(250), {
+			chunkSize: 100,
+			chunkOverlap: 0,
+		});
+
+		expect(chunks.map((chunk) => chunk.content.length)).toEqual([
+			100, 100, 50,
+		]);
+	});
+});
@@ -50,7 +50,8 @@ export function chunkText(
 	}
 
 	const chunks: TextChunk[] = [];
-	const splits = recursiveSplit(text, SEPARATORS, chunkSize);
+	const splits: string[] = [];
+	recursiveSplit(text, SEPARATORS, 0, chunkSize, splits);
 
 	let currentChunk = "";
 	let currentStart = 0;
@@ -96,33 +97,31 @@ export function chunkText(
 /**
  * Recursively split text using a hierarchy of separators.
  * Falls back to finer-grained separators when chunks are too large.
+ * Splits are appended to `result` to avoid allocating an array per level.
  */
 function recursiveSplit(
 	text: string,
 	separators: string[],
-	chunkSize: number
-): string[] {
-	if (text.length <= chunkSize || separators.length === 0) {
-		return [text];
+	separatorIndex: number,
+	chunkSize: number,
+	result: string[]
+): void {
+	if (text.length <= chunkSize || separatorIndex >= separators.length) {
+		result.push(text);
+		return;
 	}
 
-	const separator = separators[0];
-	const remainingSeparators = separators.slice(1);
-
 	// Split by current separator
-	const parts = splitKeepingSeparator(text, separator);
+	const parts = splitKeepingSeparator(text, separators[separatorIndex]);
 
-	const result: string[] = [];
 	for (const part of parts) {
 		if (part.length <= chunkSize) {
 			result.push(part);
 		} else {
 			// Part is still too large, try finer separator
-			result.push(...recursiveSplit(part, remainingSeparators, chunkSize));
+			recursiveSplit(part, separators, separatorIndex + 1, chunkSize, result);
 		}
 	}
-
-	return result;
 }
 
 /**
@@ -135,21 +134,22 @@ function splitKeepingSeparator(text: string, separator: string): string[] {
 	}
 
 	const parts: string[] = [];
-	let remaining = text;
+	let start = 0;
 
-	while (remaining.length > 0) {
-		const index = remaining.indexOf(separator);
+	while (start < text.length) {
+		const index = text.indexOf(separator, start);
 		if (index === -1) {
-			parts.push(remaining);
+			parts.push(text.slice(start));
 			break;
 		}
 
 		// Include separator in the split part
-		parts.push(remaining.slice(0, index + separator.length));
-		remaining = remaining.slice(index + separator.length);
+		const end = index + separator.length;
+		parts.push(text.slice(start, end));
+		start = end;
 	}
 
-	return parts.filter((p) => p.length > 0);
+	return parts;
 }
 
 /**
@@ -18,8 +18,12 @@ import { emitToWebsite } from "@workers/realtime";
 import { type Job, Worker } from "bullmq";
 import { and, eq, inArray, notInArray, sql } from "drizzle-orm";
 
-// Batch size for embedding generation (to avoid hitting API limits)
-const EMBEDDING_BATCH_SIZE = 20;
+// Chunks embedded per generateEmbeddings call. generateEmbeddings splits this
+// into 96-text upstream requests and sends up to 5 of them concurrently.
+const EMBEDDING_BATCH_SIZE = 480;
+
+// Rows per insert statement, to keep statements with 1536-d vectors bounded
+const INSERT_BATCH_SIZE = 100;
 
 const WORKER_CONFIG = {
 	concurrency: 1,
@@ -234,13 +238,16 @@ async function processTrainingJob(job: Job<AiTrainingJobData>): Promise<void> {
 				continue;
 			}
 
-			// Generate metadata for chunks
-			const metadata = generateChunkMetadata(
-				knowledgeItem.type as "url" | "faq" | "article",
-				knowledgeItem.payload,
-				knowledgeItem.sourceUrl,
-				knowledgeItem.sourceTitle
-			);
+			// Generate metadata shared by every chunk of this knowledge item
+			const chunkMetadata = {
+				...generateChunkMetadata(
+					knowledgeItem.type as "url" | "faq" | "article",
+					knowledgeItem.payload,
+					knowledgeItem.sourceUrl,
+					knowledgeItem.sourceTitle
+				),
+				contentHash: knowledgeItem.contentHash,
+			};
 
 			// Build a contextual prefix so embeddings carry source semantics
 			const contextParts: string[] = [];
@@ -256,17 +263,35 @@ async function processTrainingJob(job: Job<AiTrainingJobData>): Promise<void> {
 					: "";
 
 			// Process chunks in batches for embedding generation
+			const chunkBatches: (typeof chunks)[] = [];
 			for (let i = 0; i < chunks.length; i += EMBEDDING_BATCH_SIZE) {
-				const chunkBatch = chunks.slice(i, i + EMBEDDING_BATCH_SIZE);
-				// Prepend source context to each chunk for richer embeddings
-				const chunkTexts = chunkBatch.map(
-					(c) => `${contextPrefix}${c.content}`
+				chunkBatches.push(chunks.slice(i, i + EMBEDDING_BATCH_SIZE));
+			}
+
+			// Prepend source context to each chunk for richer embeddings
+			const embedBatch = (chunkBatch: typeof chunks) => {
+				const pending = generateEmbeddings(
+					chunkBatch.map((c) => `${contextPrefix}${c.content}`)
 				);
+				// Rejections surface when the batch is awaited; this only avoids an
+				// unhandled rejection if an earlier insert fails first
+				pending.catch(() => {});
+				return pending;
+			};
 
-				// Generate embeddings for this batch
-				const embeddings = await generateEmbeddings(chunkTexts);
+			let pendingEmbeddings = embedBatch(chunkBatches[0]);
+
+			for (const [i, chunkBatch] of chunkBatches.entries()) {
+				const embeddings = await pendingEmbeddings;
+
+				// Start embedding the next batch while this one is being inserted
+				const nextBatch = chunkBatches[i + 1];
+				if (nextBatch) {
+					pendingEmbeddings = embedBatch(nextBatch);
+				}
 
 				// Insert chunks into database with contentHash for incremental detection
+				const now = new Date().toISOString();
 				const chunkInserts = chunkBatch.map((chunk, batchIndex) => ({
 					id: generateULID(),
 					websiteId,
@@ -278,16 +303,19 @@ async function processTrainingJob(job: Job<AiTrainingJobData>): Promise<void> {
 					embedding: embeddings[batchIndex],
 					chunkIndex: chunk.index,
 					metadata: {
-						...metadata,
-						contentHash: knowledgeItem.contentHash,
+						...chunkMetadata,
 						startOffset: chunk.startOffset,
 						endOffset: chunk.endOffset,
 					},
-					createdAt: new Date().toISOString(),
-					updatedAt: new Date().toISOString(),
+					createdAt: now,
+					updatedAt: now,
 				}));
 
-				await db.insert(chunkTable).values(chunkInserts);
+				for (let j = 0; j < chunkInserts.length; j += INSERT_BATCH_SIZE) {
+					await db
+						.insert(chunkTable)
+						.values(chunkInserts.slice(j, j + INSERT_BATCH_SIZE));
+				}
 				totalChunks += chunkBatch.length;
 			}
 